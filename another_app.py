@@ -4,7 +4,36 @@ import geopandas as gpd
 import folium
 from streamlit_folium import folium_static
 import os
-import plotly.graph_objects as go
+import math
+
+# Prefer the pyogrio engine globally so any later reads inherit it
+try:
+    import pyogrio
+    gpd.options.io_engine = "pyogrio"
+except ImportError:
+    pyogrio = None
+
+# Only the attribute columns the dashboard actually uses - restricting the
+# read lets GDAL skip the rest of the .dbf entirely
+SHAPEFILE_COLUMNS = [
+    'NAME_1', 'NAME_2', 'Adaptation', 'Mitigation', 'Replacment', 'General_SI',
+    'aridity', 'CI_____1', 'Irrig_cov_', 'C_Land_Rc', 'GW_dev_sta', 'C_Ag_All', 'C_S_H'
+]
+
+# Define parameter mapping - reduced set for speed
+PARAMETER_MAPPING = {
+    "Solar Radiance": "aridity",
+    "Cropping Intensity (%)": "CI_____1",
+    "Irrigation Coverage (%)": "Irrig_cov_",
+    "Cultivated Land (% of total)": "C_Land_Rc",
+    "Groundwater Development (%)": "GW_dev_sta",
+    "Farmers Average Area (ha)": "C_Ag_All",
+    "Small & Marginal Holdings (%)": "C_S_H",
+    "Aridity Index": "aridity"
+}
+
+# Numeric columns behind PARAMETER_MAPPING, pre-aggregated at load time
+PARAM_COLS = list(dict.fromkeys(PARAMETER_MAPPING.values()))
 
 # Set page configuration
 st.set_page_config(
@@ -86,20 +115,57 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Optimized cache functions with TTL and compression
-@st.cache_data(ttl=3600, show_spinner="Loading geographic data...", max_entries=3)
+@st.cache_resource(ttl=3600, show_spinner="Loading geographic data...", max_entries=3)
 def load_and_preprocess_shapefile(file_path):
     """Load shapefile with optimized settings"""
-    try:
-        # Load with specific optimizations
-        gdf = gpd.read_file(file_path, engine='pyogrio')  # Faster engine if available
-    except:
+    # GeoParquet sidecar - columnar Arrow read is much faster than OGR
+    # feature iteration, so cold starts skip shapefile parsing entirely
+    parquet_path = file_path + ".parquet"
+    gdf = None
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+        try:
+            gdf = gpd.read_parquet(parquet_path)
+        except:
+            gdf = None
+
+    if gdf is None:
+        try:
+            # Arrow columnar read path - skips per-feature Python object creation
+            gdf = pyogrio.read_dataframe(file_path, use_arrow=True, columns=SHAPEFILE_COLUMNS)
+        except:
+            try:
+                gdf = gpd.read_file(file_path, engine='fiona')  # Fallback
+            except:
+                gdf = gpd.read_file(file_path)  # Default
+
+        # The fallback engines can't push the column selection into the read,
+        # so project down to the same set afterwards - keeps the frame and the
+        # parquet sidecar equally lean on every path
+        keep = [c for c in SHAPEFILE_COLUMNS if c in gdf.columns]
+        if 'geometry' in gdf.columns:
+            keep.append('geometry')
+        gdf = gdf[keep]
+
+        # Persist for the next cold start
         try:
-            gdf = gpd.read_file(file_path, engine='fiona')  # Fallback
+            gdf.to_parquet(parquet_path, compression='zstd', geometry_encoding='WKB')
         except:
-            gdf = gpd.read_file(file_path)  # Default
+            pass
     
     # Optimize geometry for faster rendering
     gdf = gdf.to_crs('EPSG:4326')  # Ensure proper CRS
+
+    # Categorical dtypes - equality filters become integer code comparisons
+    # and the name/category columns shrink ~10x in memory
+    for col in ['NAME_1', 'NAME_2', 'Adaptation', 'Mitigation', 'Replacment', 'General_SI']:
+        if col in gdf.columns:
+            gdf[col] = gdf[col].astype('category')
+
+    # Downcast parameter floats - the dashboard shows 2 decimals, and float32
+    # halves the memory the groupby aggregations have to stream
+    for col in PARAM_COLS:
+        if col in gdf.columns and gdf[col].dtype.kind in 'if':
+            gdf[col] = pd.to_numeric(gdf[col], downcast='float')
     
     # Preprocess data for faster filtering
     processed_data = {
@@ -110,14 +176,57 @@ def load_and_preprocess_shapefile(file_path):
         'bounds': gdf.geometry.total_bounds
     }
     
-    # Pre-calculate districts for each state
-    for state in processed_data['states'][1:]:
-        state_districts = gdf[gdf["NAME_1"] == state]["NAME_2"].unique()
-        processed_data['districts_by_state'][state] = ["All Districts"] + sorted([str(d) for d in state_districts if d is not None and str(d) != "nan"])
-    
+    # Pre-calculate districts for each state in one vectorized pass
+    grp = gdf.groupby("NAME_1", sort=False, observed=True)["NAME_2"].unique()
+    processed_data['districts_by_state'] = {
+        state: ["All Districts"] + sorted(str(d) for d in arr if d is not None and str(d) != "nan")
+        for state, arr in grp.items()
+    }
+
+    # Pre-aggregate category distributions at district, state and national
+    # level so each rerun is an O(1) dict lookup instead of a value_counts scan
+    category_counts = {}
+    for cat in processed_data['categories']:
+        for (state, district, value), count in gdf.groupby(['NAME_1', 'NAME_2'], observed=True)[cat].value_counts().items():
+            if count:
+                category_counts.setdefault((state, district, cat), {})[value] = int(count)
+        for (state, value), count in gdf.groupby('NAME_1', observed=True)[cat].value_counts().items():
+            if count:
+                category_counts.setdefault((state, "All Districts", cat), {})[value] = int(count)
+        category_counts[("All States", "All Districts", cat)] = {
+            value: int(count) for value, count in gdf[cat].value_counts().items() if count
+        }
+    processed_data['category_counts'] = category_counts
+
+    # Pre-aggregate parameter means at district, state and national level so
+    # interaction-time cost is a hash lookup instead of filter + mean
+    param_cols = [c for c in PARAM_COLS if c in gdf.columns and gdf[c].dtype.kind in 'if']
+    processed_data['district_means'] = gdf.groupby(['NAME_1', 'NAME_2'], observed=True)[param_cols].mean()
+    processed_data['state_means'] = gdf.groupby('NAME_1', observed=True)[param_cols].mean()
+    processed_data['all_means'] = gdf[param_cols].mean()
+
+    # Integer row positions per selection - slicing becomes a single gather
+    # with no comparison work at interaction time
+    processed_data['district_indices'] = gdf.groupby(['NAME_1', 'NAME_2'], sort=False, observed=True).indices
+    processed_data['state_indices'] = gdf.groupby('NAME_1', sort=False, observed=True).indices
+
+    # Per-state bounding boxes for clipping the map payload to the viewport
+    processed_data['state_bounds'] = {
+        state: tuple(gdf.geometry.iloc[idx].total_bounds)
+        for state, idx in processed_data['state_indices'].items()
+    }
+
+    # Simplification pyramid - zoomed-out views don't need full coordinate
+    # precision, and the coarser tiers shrink the GeoJSON payload 5-20x
+    processed_data['gdf_simplified'] = {
+        4: gdf.assign(geometry=gdf.geometry.simplify(0.05, preserve_topology=False)),
+        6: gdf.assign(geometry=gdf.geometry.simplify(0.01, preserve_topology=False)),
+        7: gdf,
+    }
+
     return processed_data
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@st.cache_resource(ttl=3600, show_spinner=False)
 def get_category_colors():
     """Pre-cache all color mappings"""
     return {
@@ -160,45 +269,117 @@ def get_category_colors():
         }
     }
 
-def get_parameter_values_optimized(gdf, state, district, category):
-    """Optimized parameter calculation without caching for speed"""
-    # Fast filtering using pandas operations
-    filtered_data = gdf.copy()
+@st.cache_data(ttl=3600, show_spinner=False)
+def render_pie_svg(labels, values, colors):
+    """Build the distribution donut as an inline SVG string.
+
+    For a dozen slices this is orders of magnitude cheaper than shipping
+    and laying out a Plotly figure, and the string caches per distribution.
+    """
+    total = sum(values) or 1
+    radius = 70
+    circumference = 2 * math.pi * radius
+    offset = 0.25 * circumference  # start at 12 o'clock
+    parts = ['<svg width="100%" height="220" viewBox="0 0 220 220">']
+    for value, color in zip(values, colors):
+        dash = (value / total) * circumference
+        parts.append(
+            f'<circle cx="110" cy="110" r="{radius}" fill="none" stroke="{color}" '
+            f'stroke-width="50" stroke-dasharray="{dash:.2f} {circumference - dash:.2f}" '
+            f'stroke-dashoffset="{offset:.2f}"></circle>'
+        )
+        offset -= dash
+    parts.append('</svg>')
+    for label, value, color in zip(labels, values, colors):
+        pct = 100.0 * value / total
+        display = label[:30] + "..." if len(label) > 30 else label
+        parts.append(
+            f'<div style="display:flex;justify-content:space-between;padding:0.15rem 0;">'
+            f'<span style="color:#CCCCCC;font-size:0.75rem;">'
+            f'<span style="display:inline-block;width:10px;height:10px;background:{color};'
+            f'margin-right:6px;border-radius:2px;"></span>{display}</span>'
+            f'<span style="color:#4CAF50;font-size:0.75rem;font-weight:bold;">{pct:.1f}%</span></div>'
+        )
+    return ''.join(parts)
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def get_geojson_bytes(state, district, category, zoom_level=7):
+    """Serialize the filtered selection to GeoJSON once per selection.
+
+    Returns UTF-8 bytes so the cached value is a compact buffer; callers
+    decode on the way into Folium.
+    """
+    processed_data = load_and_preprocess_shapefile(shapefile_path)
+    # Pick the simplification tier matching the zoom level
+    pyramid = processed_data['gdf_simplified']
+    if zoom_level <= 5:
+        gdf = pyramid[4]
+    elif zoom_level == 6:
+        gdf = pyramid[6]
+    else:
+        gdf = pyramid[7]
+    mask = pd.Series(True, index=gdf.index)
     if state != "All States":
-        filtered_data = filtered_data[filtered_data["NAME_1"] == state]
+        mask &= (gdf["NAME_1"].values == state)
     if district != "All Districts":
-        filtered_data = filtered_data[filtered_data["NAME_2"] == district]
+        mask &= (gdf["NAME_2"].values == district)
+    # Only ship the properties the map actually reads - cuts the string size
+    keep = [c for c in (category, 'NAME_2') if c in gdf.columns] + ['geometry']
+    sliced = gdf.loc[mask, keep]
+    # Clip stray multipart geometries outside the selected state's bbox so
+    # they never reach the serialized payload
+    if state != "All States":
+        bounds = processed_data['state_bounds'].get(state)
+        if bounds is not None:
+            sliced = sliced.cx[bounds[0]:bounds[2], bounds[1]:bounds[3]]
+    # Bake the fill color into the features so styling is a constant lookup.
+    # Mapping over the categorical resolves one color per distinct value and
+    # gathers the rest at C level instead of one dict lookup per feature.
+    if category in sliced.columns:
+        colors = get_category_colors().get(category, {})
+        fills = sliced[category].astype('category').map(colors)
+        sliced = sliced.assign(__fill__=fills.fillna('#BBBBBB').values)
+    return sliced.to_json().encode()
+
+def get_parameter_values_optimized(processed_data, state, district, category):
+    """Optimized parameter calculation without caching for speed"""
+    gdf = processed_data['gdf']
+    # Fast filtering - O(1) lookup of precomputed row positions, one gather
+    if state != "All States" and district != "All Districts":
+        idx = processed_data['district_indices'].get((state, district))
+        filtered_data = gdf.iloc[idx] if idx is not None else gdf.iloc[[]]
+    elif state != "All States":
+        idx = processed_data['state_indices'].get(state)
+        filtered_data = gdf.iloc[idx] if idx is not None else gdf.iloc[[]]
+    else:
+        filtered_data = gdf
     
-    # Define parameter mapping - reduced set for speed
-    PARAMETER_MAPPING = {
-        "Solar Radiance": "aridity",
-        "Cropping Intensity (%)": "CI_____1",
-        "Irrigation Coverage (%)": "Irrig_cov_",
-        "Cultivated Land (% of total)": "C_Land_Rc",
-        "Groundwater Development (%)": "GW_dev_sta",
-        "Farmers Average Area (ha)": "C_Ag_All",
-        "Small & Marginal Holdings (%)": "C_S_H",
-        "Aridity Index": "aridity"
-    }
+    # Means come from the tables pre-aggregated at load time
+    if state != "All States" and district != "All Districts":
+        district_means = processed_data['district_means']
+        means = district_means.loc[(state, district)] if (state, district) in district_means.index else None
+    elif state != "All States":
+        state_means = processed_data['state_means']
+        means = state_means.loc[state] if state in state_means.index else None
+    else:
+        means = processed_data['all_means']
+
+    # Format all means in one vectorized pass; anything missing shows "N/A"
+    if means is None:
+        parameter_values = {name: "N/A" for name in PARAMETER_MAPPING}
+    else:
+        formatted = means.map("{:.2f}".format).replace('nan', 'N/A').reindex(PARAM_COLS, fill_value='N/A')
+        parameter_values = {name: formatted[col] for name, col in PARAMETER_MAPPING.items()}
     
-    # Fast parameter calculation
-    parameter_values = {}
-    for param_name, column_name in PARAMETER_MAPPING.items():
-        if column_name in filtered_data.columns:
-            values = filtered_data[column_name].dropna()
-            if len(values) > 0 and values.dtype in ['float64', 'int64']:
-                parameter_values[param_name] = f"{values.mean():.2f}"
-            else:
-                parameter_values[param_name] = "N/A"
+    # Statistics come from the lookup table built at load time; for any key
+    # outside the table, count directly on the slice - no intermediate copy
+    stats_dict = processed_data['category_counts'].get((state, district, category))
+    if stats_dict is None:
+        if category in gdf.columns:
+            stats_dict = {k: int(v) for k, v in filtered_data[category].value_counts().items() if v}
         else:
-            parameter_values[param_name] = "N/A"
-    
-    # Calculate statistics here to avoid extra function calls
-    stats_dict = {}
-    if category in filtered_data.columns:
-        stats_data = filtered_data[category].value_counts()
-        stats_dict = stats_data.to_dict()
-    
+            stats_dict = {}
+
     return parameter_values, filtered_data, stats_dict
 
 # Categories mapping
@@ -209,19 +390,24 @@ categories = {
     "General_SI": "General SI"
 }
 
-# Try to find the shapefile
-shapefile_path = "Solar_Suitability_layer.shp"
-for file in os.listdir('.'):
-    if file.endswith('.shp'):
-        shapefile_path = file
-        break
+# Try to find the shapefile - resolved once, not on every rerun
+@st.cache_resource(show_spinner=False)
+def find_shapefile():
+    """Locate the shapefile once instead of scanning the directory per rerun"""
+    default = "Solar_Suitability_layer.shp"
+    if os.path.exists(default):
+        return default
+    for file in os.listdir('.'):
+        if file.endswith('.shp'):
+            return file
+    return default
 
-# Load data with progress indicator
-if 'processed_data' not in st.session_state:
-    st.session_state.processed_data = load_and_preprocess_shapefile(shapefile_path)
-    st.session_state.color_mappings = get_category_colors()
+shapefile_path = find_shapefile()
 
-processed_data = st.session_state.processed_data
+# cache_resource hands back a shared in-process reference - no pickling on
+# rerun and no session_state mirror needed
+processed_data = load_and_preprocess_shapefile(shapefile_path)
+color_mappings = get_category_colors()
 
 if processed_data is not None:
     # Dashboard Header
@@ -257,7 +443,7 @@ if processed_data is not None:
     
     # Fast data processing
     parameter_values, filtered_gdf, stats_dict = get_parameter_values_optimized(
-        processed_data['gdf'], selected_state, selected_district, selected_category
+        processed_data, selected_state, selected_district, selected_category
     )
     
     # Main Dashboard Layout - 3 columns
@@ -274,20 +460,20 @@ if processed_data is not None:
             "Farmers Average Area (ha)": "👨‍🌾", "Small & Marginal Holdings (%)": "👨‍🌾", "Aridity Index": "☀️"
         }
         
-        for param, value in parameter_values.items():
-            icon = icons.get(param, "📊")
-            st.markdown(f"""
+        # One markdown element for all cards - a single Streamlit round-trip
+        cards_html = "".join(f"""
             <div class="metric-card">
                 <div style="display: flex; justify-content: space-between; align-items: center;">
                     <div style="font-size: 0.85rem; color: #CCCCCC;">
-                        {icon} {param}
+                        {icons.get(param, "📊")} {param}
                     </div>
                     <div style="font-size: 1.1rem; font-weight: bold; color: #4CAF50;">
                         {value}
                     </div>
                 </div>
             </div>
-            """, unsafe_allow_html=True)
+            """ for param, value in parameter_values.items())
+        st.markdown(cards_html, unsafe_allow_html=True)
     
     # CENTER COLUMN - Optimized Map
     with center_col:
@@ -320,33 +506,26 @@ if processed_data is not None:
             # Optimized map creation
             m = folium.Map(location=center, zoom_start=zoom_level, tiles="CartoDB dark_matter")
             
-            # Fast color mapping
-            category_colors = st.session_state.color_mappings.get(selected_category, {})
-            
-            # Optimized style function
+            # Styling reads the precomputed __fill__ property - constant
+            # across features, no per-feature color resolution
             def style_function(feature):
-                cat_val = feature['properties'].get(selected_category)
-                if cat_val and str(cat_val) in category_colors:
-                    color = category_colors[str(cat_val)]
-                else:
-                    color = '#BBBBBB'
-                
                 return {
-                    'fillColor': color,
+                    'fillColor': feature['properties'].get('__fill__', '#BBBBBB'),
                     'color': 'black',
                     'weight': 1,
                     'fillOpacity': 0.7
                 }
             
-            # Add optimized GeoJSON layer - simplified for large datasets
+            # Add optimized GeoJSON layer - serialized once per selection
+            geojson_data = get_geojson_bytes(selected_state, selected_district, selected_category, zoom_level).decode()
             if len(filtered_gdf) > 500:  # For large datasets, skip tooltips
                 folium.GeoJson(
-                    filtered_gdf.to_json(),
+                    geojson_data,
                     style_function=style_function
                 ).add_to(m)
             else:
                 folium.GeoJson(
-                    filtered_gdf.to_json(),
+                    geojson_data,
                     style_function=style_function,
                     tooltip=folium.GeoJsonTooltip(
                         fields=["NAME_2", selected_category],
@@ -368,30 +547,10 @@ if processed_data is not None:
         st.markdown('<div class="section-header">📈 Distribution</div>', unsafe_allow_html=True)
         
         if stats_dict:
-            labels = list(stats_dict.keys())
-            values = list(stats_dict.values())
-            colors = [st.session_state.color_mappings.get(selected_category, {}).get(str(label), "#BBBBBB") for label in labels]
-            
-            fig = go.Figure(data=[go.Pie(
-                labels=labels,
-                values=values,
-                marker=dict(colors=colors),
-                textinfo='label+percent',
-                textposition='auto',
-                textfont=dict(size=8, color='white'),
-                showlegend=False,
-                hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-            )])
-            
-            fig.update_layout(
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white', size=8),
-                margin=dict(t=20, b=20, l=20, r=20),
-                height=280
-            )
-            
-            st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+            labels = tuple(str(label) for label in stats_dict.keys())
+            values = tuple(stats_dict.values())
+            colors = tuple(color_mappings.get(selected_category, {}).get(label, "#BBBBBB") for label in labels)
+            st.markdown(render_pie_svg(labels, values, colors), unsafe_allow_html=True)
         else:
             st.info("No data to display")
         
@@ -408,13 +567,13 @@ if processed_data is not None:
             ("📋 Features", str(len(filtered_gdf)))
         ]
         
-        for label, value in info_items:
-            st.markdown(f"""
+        info_html = "".join(f"""
             <div style="display: flex; justify-content: space-between; padding: 0.3rem 0; border-bottom: 1px solid #333;">
                 <span style="color: #CCCCCC; font-size: 0.85rem;">{label}</span>
                 <span style="color: #4CAF50; font-weight: bold; font-size: 0.85rem;">{value}</span>
             </div>
-            """, unsafe_allow_html=True)
+            """ for label, value in info_items)
+        st.markdown(info_html, unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -3,16 +3,24 @@ import pandas as pd
 import geopandas as gpd
 import folium
 from streamlit_folium import st_folium
-from streamlit_folium import folium_static
+import glob
 import os
-import matplotlib.pyplot as plt
 import numpy as np
 
+# Numba is optional - the hot histogram falls back to numpy's C-level
+# bincount when it is not installed
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Helper for formatting values with units
 def format_value_with_unit(value, unit):
     if pd.notna(value) and str(value) not in ['XX', 'N/A', 'nan', '']:
         try:
-            if isinstance(value, (int, float)):
+            # np.floating covers the float32 columns from the load-time
+            # downcast, which are not Python float subclasses
+            if isinstance(value, (int, float, np.floating)):
                 return f"{value:.1f} {unit}".strip()
             else:
                 return f"{value} {unit}".strip()
@@ -200,13 +208,43 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Cache data loading
-@st.cache_data(ttl=3600)
+# Cache data loading - cache_resource shares the in-memory object across
+# sessions instead of pickling the whole GeoDataFrame per cache hit; callers
+# treat it as read-only
+@st.cache_resource(ttl=3600)
 def load_shapefile(file_path):
     try:
+        # Persist the simplified GDF next to the .shp - cold starts then skip
+        # both OGR shapefile parsing and re-simplification
+        cache_path = file_path + ".simplified.parquet"
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+            try:
+                gdf = gpd.read_parquet(cache_path)
+                gdf.attrs['total_bounds'] = tuple(gdf.geometry.total_bounds)
+                return gdf
+            except Exception:
+                pass  # corrupt or incompatible sidecar - reparse the shapefile
         gdf = gpd.read_file(file_path)
+        # Keep only the columns the dashboard reads and downcast the floats -
+        # every later copy, mask and cache entry shrinks proportionally
+        gdf = gdf[[c for c in KEEP_COLS if c in gdf.columns]]
+        for c in gdf.columns:
+            if c != 'geometry' and gdf[c].dtype.kind in 'if':
+                gdf[c] = pd.to_numeric(gdf[c], downcast='float')
+        # Categoricals make the equality filters integer comparisons and cut
+        # the per-row string storage to small codes
+        for c in ['NAME_1', 'NAME_2'] + list(categories.keys()):
+            if c in gdf.columns:
+                gdf[c] = gdf[c].astype('category')
         if len(gdf) > 100:
             gdf.geometry = gdf.geometry.simplify(0.001, preserve_topology=False)
+        try:
+            gdf.to_parquet(cache_path)
+        except Exception:
+            pass
+        # Full-dataset bounds never change, so pay the envelope scan once here
+        # instead of on every "All States" rerun
+        gdf.attrs['total_bounds'] = tuple(gdf.geometry.total_bounds)
         return gdf
     except Exception as e:
         st.error(f"Error loading shapefile: {e}")
@@ -230,6 +268,18 @@ PARAMETER_MAPPING = {
     "Number of Pumps": "No of pump"
 }
 
+# Icons are a function of the static parameter names - resolve them once
+# at import instead of substring-matching every parameter on every rerun
+PARAM_ICONS = {
+    p: ("☀️" if "Solar" in p or "Aridity" in p
+        else "💧" if "Water" in p or "Irrigation" in p
+        else "🌾" if "Land" in p or "Area" in p
+        else "⚡" if "Energy" in p or "Electric" in p
+        else "👨‍🌾" if "Farmers" in p or "Holdings" in p
+        else "📊")
+    for p in PARAMETER_MAPPING
+}
+
 # Objective tooltips
 OBJECTIVE_TOOLTIPS = {
     "Adapt": "Focuses on helping farmers adapt to climate change impacts through solar solutions for irrigation and crop management.",
@@ -240,23 +290,308 @@ OBJECTIVE_TOOLTIPS = {
 
 categories = {
     "Adapt": "Adaptation",
-    "Mitigate": "Mitigation", 
+    "Mitigate": "Mitigation",
     "Replace": "Replacement",
     "General_SI": "General SI"
 }
 
-def calculate_statistics(gdf, category):
+# Columns the district drill-down reads beyond the parameter mapping
+DISTRICT_DETAIL_COLS = [
+    "Diesel (%)", "Emission (", "DISCOM Nam", "DISCOM Rat",
+    "Text-Crop", "Text-Water", "Text-Utilt", "Text-Farme"
+]
+
+# Everything the app touches - anything else is dropped straight after load
+KEEP_COLS = (["NAME_1", "NAME_2", "geometry"] + list(PARAMETER_MAPPING.values())
+             + list(categories.keys()) + DISTRICT_DETAIL_COLS)
+
+@st.cache_resource(ttl=3600)
+def _build_indexes(_gdf):
+    """
+    Precompute the dropdown lists once. Streamlit reruns the whole script
+    per widget change, so these O(N) scans should not happen on every
+    interaction.
+    """
+    def _labels(col):
+        # Categorical columns keep their distinct values in the tiny
+        # categories index - no O(N) unique scan needed
+        vals = col.cat.categories if isinstance(col.dtype, pd.CategoricalDtype) else col.unique()
+        return sorted(str(v) for v in vals if v is not None and str(v) != "nan")
+
+    states = []
+    if "NAME_1" in _gdf.columns:
+        states = _labels(_gdf["NAME_1"])
+
+    districts_by_state = {}
+    if "NAME_2" in _gdf.columns:
+        districts_by_state["All States"] = _labels(_gdf["NAME_2"])
+        grp = _gdf.groupby("NAME_1", observed=True)["NAME_2"].unique()
+        for state, arr in grp.items():
+            districts_by_state[str(state)] = sorted(str(d) for d in arr if d is not None and str(d) != "nan")
+
+    return states, districts_by_state
+
+@st.cache_resource(ttl=3600)
+def _geometry_tiers(_gdf):
+    """
+    Coarser geometry copies for the wide map views. The national view does
+    not need 0.001-degree detail - simplifying it harder cuts the GeoJSON
+    payload by roughly an order of magnitude, which is what the browser
+    spends its time on at the default zoom. Districts are kept as separate
+    features at every tier because the choropleth colors are per-district.
+    """
+    national = _gdf.copy()
+    national.geometry = national.geometry.simplify(0.02, preserve_topology=False)
+    state = _gdf.copy()
+    state.geometry = state.geometry.simplify(0.005, preserve_topology=False)
+    return {'national': national, 'state': state, 'detail': _gdf}
+
+@st.cache_resource(ttl=3600)
+def geojson_for(state, district, category):
+    """
+    GeoJSON text for a selection, serialized once and reused across reruns.
+    Shapely-to-GeoJSON conversion is the heaviest per-rerun cost in the map
+    column, so it must not repeat for the same filters.
+    """
+    tiers = _geometry_tiers(load_shapefile(shapefile_path))
+    if state == "All States":
+        gdf = tiers['national']
+    elif district == "All Districts":
+        gdf = tiers['state']
+    else:
+        gdf = tiers['detail']
+    if state != "All States":
+        gdf = gdf[gdf["NAME_1"] == state]
+    if district != "All Districts":
+        gdf = gdf[gdf["NAME_2"] == district]
+    if category in gdf.columns:
+        # Resolve fill colors vectorized (exact match, then the substring
+        # fallback) and bake them into the features, so the Folium style
+        # function is a plain property read instead of per-feature branching
+        values = gdf[category].astype(str)
+        fills = values.map(get_category_colors(category))
+        fallback = np.select(
+            [values.str.contains("Less Suitable", na=False),
+             values.str.contains("Moderately Suitable", na=False),
+             values.str.contains("Highly Suitable", na=False),
+             values.str.contains("Very Highly Suitable", na=False)],
+            ['#FF6B6B', '#845EC2', '#00ADB5', '#2ECC71'],
+            default='#2C2E33'
+        )
+        gdf = gdf.assign(fill_color=fills.fillna(pd.Series(fallback, index=values.index)))
+    return gdf.to_json()
+
+@st.cache_data(ttl=3600, max_entries=64)
+def _map_html(state, district, category):
+    """
+    Fully rendered Folium map HTML for a selection. Rendering runs GeoJSON
+    embedding plus Jinja templating - pure CPU that should not repeat when
+    a user flips back to filters they already viewed.
+    """
+    gdf = load_shapefile(shapefile_path)
+
+    # Map bounds calculation
+    if state == "All States":
+        try:
+            full_bounds = gdf.attrs['total_bounds']
+            center = [(full_bounds[1] + full_bounds[3]) / 2,
+                      (full_bounds[0] + full_bounds[2]) / 2]
+            zoom_level = 4
+        except:
+            center = [20.5937, 78.9629]
+            zoom_level = 4
+    else:
+        try:
+            bounds = bounds_for(state, district)
+            center = [(bounds[1] + bounds[3]) / 2, (bounds[0] + bounds[2]) / 2]
+
+            lat_diff = bounds[3] - bounds[1]
+            lon_diff = bounds[2] - bounds[0]
+
+            if lat_diff > 8 or lon_diff > 8:
+                zoom_level = 6
+            elif lat_diff > 3 or lon_diff > 3:
+                zoom_level = 7
+            elif lat_diff > 1 or lon_diff > 1:
+                zoom_level = 8
+            else:
+                zoom_level = 9
+        except:
+            center = [20.5937, 78.9629]
+            zoom_level = 5
+
+    m = folium.Map(location=center, zoom_start=zoom_level, tiles="CartoDB dark_matter")
+
+    # Fit bounds for full view
+    if state == "All States":
+        try:
+            full_bounds = gdf.attrs['total_bounds']
+            lat_padding = (full_bounds[3] - full_bounds[1]) * 0.05
+            lon_padding = (full_bounds[2] - full_bounds[0]) * 0.05
+
+            southwest = [full_bounds[1] - lat_padding, full_bounds[0] - lon_padding]
+            northeast = [full_bounds[3] + lat_padding, full_bounds[2] + lon_padding]
+
+            m.fit_bounds([southwest, northeast])
+        except:
+            pass
+
+    # Style function - reads the precomputed fill_color property
+    def style_function(feature):
+        return {'fillColor': feature['properties'].get('fill_color', '#2C2E33'),
+                'color': 'black', 'weight': 1, 'fillOpacity': 0.7}
+
+    folium.GeoJson(geojson_for(state, district, category), style_function=style_function).add_to(m)
+    return m.get_root().render()
+
+@st.cache_data(ttl=3600, max_entries=512)
+def bounds_for(state, district):
+    """Total bounds of a filtered view, computed once per selection"""
+    gdf = load_shapefile(shapefile_path)
+    if state != "All States":
+        gdf = gdf[gdf["NAME_1"] == state]
+    if district != "All Districts":
+        gdf = gdf[gdf["NAME_2"] == district]
+    return tuple(gdf.geometry.total_bounds)
+
+@st.cache_resource(ttl=3600)
+def _category_codes(_gdf):
+    """Integer-coded category arrays plus label tables for fast histograms"""
+    codes = {}
+    for cat in categories:
+        if cat in _gdf.columns:
+            encoded = _gdf[cat].astype('category')
+            codes[cat] = (encoded.cat.codes.to_numpy(), list(encoded.cat.categories))
+    return codes
+
+if njit is not None:
+    @njit(cache=True)
+    def _count_codes(codes, k):
+        out = np.zeros(k, np.int64)
+        for c in codes:
+            if c >= 0:
+                out[c] += 1
+        return out
+else:
+    def _count_codes(codes, k):
+        return np.bincount(codes[codes >= 0], minlength=k)
+
+@st.cache_resource(ttl=3600)
+def _numeric_arrays(_gdf):
+    """Numeric parameter columns stacked as one float32 matrix for _agg"""
+    cols = [c for c in dict.fromkeys(PARAMETER_MAPPING.values())
+            if c in _gdf.columns and _gdf[c].dtype.kind in 'if']
+    matrix = _gdf[cols].to_numpy(np.float32) if cols else np.zeros((len(_gdf), 0), np.float32)
+    return matrix, cols
+
+if njit is not None:
+    @njit(cache=True)
+    def _agg(mask, nums, codes, k):
+        counts = np.zeros(k, np.int64)
+        sums = np.zeros(nums.shape[1], np.float64)
+        n = np.zeros(nums.shape[1], np.int64)
+        for i in range(len(mask)):
+            if mask[i]:
+                c = codes[i]
+                if 0 <= c < k:
+                    counts[c] += 1
+                for j in range(nums.shape[1]):
+                    v = nums[i, j]
+                    if not np.isnan(v):
+                        sums[j] += v
+                        n[j] += 1
+        means = np.empty(nums.shape[1], np.float64)
+        for j in range(nums.shape[1]):
+            means[j] = sums[j] / n[j] if n[j] else np.nan
+        return counts, means
+else:
+    def _agg(mask, nums, codes, k):
+        sel = mask & (codes >= 0)
+        counts = np.bincount(codes[sel], minlength=k) if k else np.zeros(0, np.int64)
+        sub = nums[mask]
+        n = (~np.isnan(sub)).sum(axis=0)
+        sums = np.where(np.isnan(sub), 0.0, sub).sum(axis=0)
+        means = np.where(n > 0, sums / np.maximum(n, 1), np.nan)
+        return counts, means
+
+@st.cache_data(ttl=3600, max_entries=512)
+def _fused_agg(state, district, category):
+    """
+    Category histogram and all numeric parameter means for a selection in
+    one sweep over the precoded arrays, instead of one pandas scan per
+    parameter plus one per category column.
+    """
+    gdf = load_shapefile(shapefile_path)
+    mask = np.ones(len(gdf), dtype=bool)
+    if state != "All States":
+        mask &= (gdf["NAME_1"].values == state)
+    if district != "All Districts":
+        mask &= (gdf["NAME_2"].values == district)
+
+    code_info = _category_codes(gdf).get(category) if category else None
+    if code_info is not None:
+        code_arr, labels = code_info
+    else:
+        code_arr, labels = np.full(len(gdf), -1, np.int64), []
+
+    nums, num_cols = _numeric_arrays(gdf)
+    counts, means = _agg(mask, nums, code_arr.astype(np.int64), len(labels))
+
+    total = int(mask.sum())
+    count_stats = {}
+    for i in np.argsort(counts)[::-1]:
+        if counts[i] and str(labels[i]) != "nan":
+            count_stats[labels[i]] = {
+                'count': int(counts[i]),
+                'percentage': round((counts[i] / total) * 100, 2) if total else 0.0
+            }
+    return count_stats, {c: float(means[j]) for j, c in enumerate(num_cols)}
+
+@st.cache_data(ttl=3600, max_entries=512)
+def calculate_statistics(state, district, category):
+    # Keyed by the selection tuple - repeat clicks on the same filters hit
+    # the cache instead of rescanning the frame
+    gdf = load_shapefile(shapefile_path)
     if category not in gdf.columns:
         return None
-    
+
+    # National view counts over the precoded integer array - the full-frame
+    # scan never touches Python string comparison
+    if state == "All States" and district == "All Districts":
+        code_info = _category_codes(gdf).get(category)
+        if code_info is not None:
+            code_arr, labels = code_info
+            counts = _count_codes(code_arr, len(labels))
+            total = len(gdf)
+            stats = {'counts': {}}
+            for i in np.argsort(counts)[::-1]:
+                if counts[i] and str(labels[i]) != "nan":
+                    stats['counts'][labels[i]] = {
+                        'count': int(counts[i]),
+                        'percentage': round((counts[i] / total) * 100, 2)
+                    }
+            return stats
+
+    # Filtered views go through the fused single-pass kernel when the
+    # column has a precoded integer representation
+    if category in _category_codes(gdf):
+        count_stats, _ = _fused_agg(state, district, category)
+        return {'counts': count_stats}
+
+    if state != "All States":
+        gdf = gdf[gdf["NAME_1"] == state]
+    if district != "All Districts":
+        gdf = gdf[gdf["NAME_2"] == district]
+
     stats = {}
-    if gdf[category].dtype == 'object':
+    if gdf[category].dtype == 'object' or isinstance(gdf[category].dtype, pd.CategoricalDtype):
         value_counts = gdf[category].value_counts()
         total = len(gdf)
         
         stats['counts'] = {}
         for value, count in value_counts.items():
-            if value is not None and str(value) != "nan":
+            # Categorical value_counts also lists zero-count categories
+            if value is not None and str(value) != "nan" and count:
                 percentage = (count / total) * 100
                 stats['counts'][value] = {
                     'count': int(count),
@@ -496,32 +831,43 @@ def render_district_dashboard(district_data, selected_category):
             </div>
             """, unsafe_allow_html=True)
 
-def get_parameter_values(gdf, selected_state, selected_district):
-    filtered_data = gdf.copy()
-    
+@st.cache_data(ttl=3600, max_entries=512)
+def get_parameter_values(selected_state, selected_district):
+    # Filters below are read-only boolean masks - no upfront copy needed
+    filtered_data = load_shapefile(shapefile_path)
+
     if selected_state != "All States":
         filtered_data = filtered_data[filtered_data["NAME_1"] == selected_state]
     
     if selected_district != "All Districts":
         filtered_data = filtered_data[filtered_data["NAME_2"] == selected_district]
     
+    cols = [c for c in dict.fromkeys(PARAMETER_MAPPING.values()) if c in filtered_data.columns]
+    numeric_cols = [c for c in cols if filtered_data[c].dtype.kind in 'if']
+    object_cols = [c for c in cols if c not in numeric_cols]
+
+    # Numeric means come from the fused one-pass kernel; only the object
+    # columns still need a pandas mode pass (mode already skips NaN)
+    _, mean_map = _fused_agg(selected_state, selected_district, None)
+    means = pd.Series({c: mean_map[c] for c in numeric_cols if c in mean_map}, dtype=float)
+    modes = pd.Series(dtype=object)
+    if object_cols:
+        mode_frame = filtered_data[object_cols].mode()
+        if len(mode_frame) > 0:
+            modes = mode_frame.iloc[0]
+
     parameter_values = {}
     for param_name, column_name in PARAMETER_MAPPING.items():
-        if column_name in filtered_data.columns:
-            values = filtered_data[column_name].dropna()
-            if len(values) > 0:
-                if values.dtype in ['float64', 'int64']:
-                    parameter_values[param_name] = f"{values.mean():.2f}"
-                else:
-                    parameter_values[param_name] = str(values.mode().iloc[0]) if len(values.mode()) > 0 else "N/A"
-            else:
-                parameter_values[param_name] = "N/A"
+        if column_name in means.index and pd.notna(means[column_name]):
+            parameter_values[param_name] = f"{means[column_name]:.2f}"
+        elif column_name in modes.index and pd.notna(modes[column_name]):
+            parameter_values[param_name] = str(modes[column_name])
         else:
             parameter_values[param_name] = "N/A"
-    
+
     return parameter_values
 
-def render_national_state_dashboard(filtered_gdf, selected_category, selected_state):
+def render_national_state_dashboard(filtered_gdf, selected_category, selected_state, selected_district):
     """
     Render the original national/state level dashboard
     """
@@ -533,86 +879,12 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
         st.markdown('<div class="section-header">🗺️ Solar Suitability Map</div>', unsafe_allow_html=True)
         
         if not filtered_gdf.empty:
-            # Map bounds calculation
-            if selected_state == "All States":
-                try:
-                    full_bounds = gdf.geometry.total_bounds
-                    center_lat = (full_bounds[1] + full_bounds[3]) / 2
-                    center_lon = (full_bounds[0] + full_bounds[2]) / 2
-                    center = [center_lat, center_lon]
-                    zoom_level = 4
-                except:
-                    center = [20.5937, 78.9629]
-                    zoom_level = 4
-            else:
-                try:
-                    bounds = filtered_gdf.geometry.total_bounds
-                    center_lat = (bounds[1] + bounds[3]) / 2
-                    center_lon = (bounds[0] + bounds[2]) / 2
-                    center = [center_lat, center_lon]
-                    
-                    lat_diff = bounds[3] - bounds[1]
-                    lon_diff = bounds[2] - bounds[0]
-                    
-                    if lat_diff > 8 or lon_diff > 8:
-                        zoom_level = 6
-                    elif lat_diff > 3 or lon_diff > 3:
-                        zoom_level = 7
-                    elif lat_diff > 1 or lon_diff > 1:
-                        zoom_level = 8
-                    else:
-                        zoom_level = 9
-                except:
-                    center = [20.5937, 78.9629]
-                    zoom_level = 5
-            
-            # Create map
-            m = folium.Map(location=center, zoom_start=zoom_level, tiles="CartoDB dark_matter")
-            
-            # Fit bounds for full view
-            if selected_state == "All States":
-                try:
-                    full_bounds = gdf.geometry.total_bounds
-                    lat_padding = (full_bounds[3] - full_bounds[1]) * 0.05
-                    lon_padding = (full_bounds[2] - full_bounds[0]) * 0.05
-                    
-                    southwest = [full_bounds[1] - lat_padding, full_bounds[0] - lon_padding]
-                    northeast = [full_bounds[3] + lat_padding, full_bounds[2] + lon_padding]
-                    
-                    m.fit_bounds([southwest, northeast])
-                except:
-                    pass
-            
-            # Style function
-            category_colors = get_category_colors(selected_category)
-            
-            def style_function(feature):
-                if selected_category in feature['properties'] and feature['properties'][selected_category] is not None:
-                    category_value = str(feature['properties'][selected_category])
-                    
-                    if category_value in category_colors:
-                        color = category_colors[category_value]
-                    else:
-                        if "Less Suitable" in category_value:
-                            color = '#FF6B6B'  # Coral Red
-                        elif "Moderately Suitable" in category_value:
-                            color = '#845EC2'  # Purple
-                        elif "Highly Suitable" in category_value:
-                            color = '#00ADB5'  # Cyan/Turquoise
-                        elif "Very Highly Suitable" in category_value:
-                            color = '#2ECC71'  # Emerald Green
-                        else:
-                            color = '#2C2E33'  # Dark Gray
-                    
-                    return {'fillColor': color, 'color': 'black', 'weight': 1, 'fillOpacity': 0.7}
-                else:
-                    return {'fillColor': '#2C2E33', 'color': 'black', 'weight': 1, 'fillOpacity': 0.7}
-            
-            # Add data to map
-            folium.GeoJson(filtered_gdf, style_function=style_function).add_to(m)
-            
-            # Display map
-            folium_static(m, height=400)
+            # The whole map - bounds, GeoJson layer, template rendering - is
+            # cached per selection; only the finished HTML is re-sent
+            st.components.v1.html(
+                _map_html(selected_state, selected_district, selected_category),
+                height=400
+            )
         else:
             st.warning("No data available for selected filters.")
     
@@ -620,35 +892,35 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
     with stats_col:
         st.markdown('<div class="section-header">📊 Summary Statistics</div>', unsafe_allow_html=True)
         
-        stats = calculate_statistics(filtered_gdf, selected_category)
+        stats = calculate_statistics(selected_state, selected_district, selected_category)
         
         if stats and 'counts' in stats:
             levels = list(stats['counts'].keys())
             percentages = [stats['counts'][level]['percentage'] for level in levels]
             
-            # Show distribution
+            # Show distribution - resolve every level's color once (exact
+            # match, then the substring fallback) instead of re-running the
+            # substring chain inside the render loop
             category_colors = get_category_colors(selected_category)
-            
+            fallbacks = [("Less Suitable", '#FF6B6B'), ("Moderately Suitable", '#845EC2'),
+                         ("Highly Suitable", '#00ADB5'), ("Very Highly Suitable", '#2ECC71')]
+            resolved = {
+                level: category_colors.get(level)
+                       or next((c for s, c in fallbacks if s in level), '#2C2E33')
+                for level in levels
+            }
+            level_colors = []
+
+            # One st.markdown for the whole distribution - each call is a
+            # separate element in Streamlit's frontend protocol
+            metric_rows = []
             for level in levels:
                 percentage = stats['counts'][level]['percentage']
-                
-                if level in category_colors:
-                    color = category_colors[level]
-                else:
-                    if "Less Suitable" in level:
-                        color = '#FF6B6B'  # Coral Red
-                    elif "Moderately Suitable" in level:
-                        color = '#845EC2'  # Purple
-                    elif "Highly Suitable" in level:
-                        color = '#00ADB5'  # Cyan/Turquoise
-                    elif "Very Highly Suitable" in level:
-                        color = '#2ECC71'  # Emerald Green
-                    else:
-                        color = '#2C2E33'  # Dark Gray
-                
+                color = resolved[level]
+                level_colors.append(color)
                 display_name = level[:25] + "..." if len(level) > 25 else level
-                
-                st.markdown(f"""
+
+                metric_rows.append(f"""
                 <div class="metric-container">
                     <span class="metric-name">
                         <span style="display: inline-block; width: 10px; height: 10px; background-color: {color}; margin-right: 6px; border-radius: 2px;"></span>
@@ -656,87 +928,49 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
                     </span>
                     <span class="metric-value">{percentage:.1f}%</span>
                 </div>
-                """, unsafe_allow_html=True)
-            
-            # Compact pie chart
-            if len(levels) <= 6:
-                try:
-                    fig, ax = plt.subplots(figsize=(3.5, 3.5))
-                    pie_colors = []
-                    for level in levels:
-                        if level in category_colors:
-                            pie_colors.append(category_colors[level])
-                        else:
-                            if "Less Suitable" in level:
-                                pie_colors.append('#FF6B6B')  # Coral Red
-                            elif "Moderately Suitable" in level:
-                                pie_colors.append('#845EC2')  # Purple
-                            elif "Highly Suitable" in level:
-                                pie_colors.append('#00ADB5')  # Cyan/Turquoise
-                            elif "Very Highly Suitable" in level:
-                                pie_colors.append('#2ECC71')  # Emerald Green
-                            else:
-                                pie_colors.append('#2C2E33')  # Dark Gray
-                    wedges, texts, autotexts = ax.pie(
-                        percentages, 
-                        colors=pie_colors,
-                        autopct='%1.1f%%',
-                        startangle=90,
-                        textprops={'fontsize': 8}
-                    )
-                    fig.patch.set_facecolor('#2C3E50')
-                    ax.set_facecolor('#2C3E50')
-                    for autotext in autotexts:
-                        autotext.set_color('white')
-                        autotext.set_fontweight('bold')
-                        autotext.set_fontsize(8)
-                    for text in texts:
-                        text.set_fontsize(0)  # Hide labels to save space
-                    plt.tight_layout()
-                    st.pyplot(fig)
-                    plt.close()
-                except Exception as chart_error:
-                    st.write("Chart could not be rendered")
+                """)
+            st.markdown("".join(metric_rows), unsafe_allow_html=True)
+
+            # Compact distribution bar - plain HTML, no matplotlib figure or
+            # Agg rasterization per rerun
+            bar_segments = "".join(
+                f'<div style="background-color: {color}; width: {percentage}%;" title="{level}: {percentage:.1f}%"></div>'
+                for level, percentage, color in zip(levels, percentages, level_colors)
+            )
+            st.markdown(
+                f'<div style="display: flex; height: 20px; border-radius: 4px; overflow: hidden; margin-top: 0.5rem;">{bar_segments}</div>',
+                unsafe_allow_html=True
+            )
         else:
             st.markdown('<div class="metric-container"><span class="metric-name">No statistics available</span></div>', unsafe_allow_html=True)
     
     # PARAMETERS COLUMN  
     with params_col:
         st.markdown('<div class="section-header">📋 Key Parameters</div>', unsafe_allow_html=True)
-        parameter_values = get_parameter_values(filtered_gdf, selected_state, "All Districts")
+        parameter_values = get_parameter_values(selected_state, "All Districts")
+        param_rows = []
         for param_name, value in parameter_values.items():
-            # Get icon
-            if "Solar" in param_name or "Aridity" in param_name:
-                icon = "☀️"
-            elif "Water" in param_name or "Irrigation" in param_name:
-                icon = "💧"
-            elif "Land" in param_name or "Area" in param_name:
-                icon = "🌾"
-            elif "Energy" in param_name or "Electric" in param_name:
-                icon = "⚡"
-            elif "Farmers" in param_name or "Holdings" in param_name:
-                icon = "👨‍🌾"
-            else:
-                icon = "📊"
-            st.markdown(f"""
+            icon = PARAM_ICONS.get(param_name, "📊")
+            param_rows.append(f"""
             <div class="metric-container">
                 <span class="metric-name">{icon} {param_name}</span>
                 <span class="metric-value">{value}</span>
             </div>
-            """, unsafe_allow_html=True)
+            """)
+        # All 14 cards in one st.markdown call instead of one element each
+        st.markdown("".join(param_rows), unsafe_allow_html=True)
 
 # Main app logic
-shapefile_path = None
-if os.path.exists("true_solar_suitability.shp"):
-    shapefile_path = "true_solar_suitability.shp"
-elif os.path.exists("Solar_Suitability_layer.shp"):
-    shapefile_path = "Solar_Suitability_layer.shp"
-else:
+@st.cache_data
+def _find_shp():
+    """Locate the shapefile once instead of stat-ing the CWD every rerun"""
+    for preferred in ("true_solar_suitability.shp", "Solar_Suitability_layer.shp"):
+        if os.path.exists(preferred):
+            return preferred
     # Fallback to any .shp file
-    for file in os.listdir('.'):
-        if file.endswith('.shp'):
-            shapefile_path = file
-            break
+    return next(iter(glob.glob('*.shp')), None)
+
+shapefile_path = _find_shp()
 
 gdf = load_shapefile(shapefile_path)
 
@@ -751,25 +985,16 @@ if gdf is not None:
     st.markdown('<div class="filter-section">', unsafe_allow_html=True)
     col1, col2, col3 = st.columns(3)
     
+    state_list, districts_by_state = _build_indexes(gdf)
+
     with col1:
         st.markdown("**🌍 State**")
-        states = ["All States"]
-        if "NAME_1" in gdf.columns:
-            valid_states = [str(s) for s in gdf["NAME_1"].unique() if s is not None and str(s) != "nan"]
-            states.extend(sorted(valid_states))
+        states = ["All States"] + state_list
         selected_state = st.selectbox("State", states, label_visibility="collapsed")
-    
+
     with col2:
         st.markdown("**🏘️ District**")
-        if selected_state != "All States":
-            state_filtered = gdf[gdf["NAME_1"] == selected_state]
-        else:
-            state_filtered = gdf
-        
-        districts = ["All Districts"]
-        if "NAME_2" in gdf.columns:
-            valid_districts = [str(d) for d in state_filtered["NAME_2"].unique() if d is not None and str(d) != "nan"]
-            districts.extend(sorted(valid_districts))
+        districts = ["All Districts"] + districts_by_state.get(selected_state, [])
         selected_district = st.selectbox("District", districts, label_visibility="collapsed")
     
     with col3:
@@ -784,12 +1009,18 @@ if gdf is not None:
     
     st.markdown('</div>', unsafe_allow_html=True)
     
-    # Apply filters
-    filtered_gdf = gdf.copy()
-    if selected_state != "All States":
-        filtered_gdf = filtered_gdf[filtered_gdf["NAME_1"] == selected_state]
-    if selected_district != "All Districts":
-        filtered_gdf = filtered_gdf[filtered_gdf["NAME_2"] == selected_district]
+    # Apply filters once - reused by the map, statistics and parameter
+    # consumers below. The unfiltered case is a plain view: nothing
+    # downstream mutates filtered_gdf, so no allocation is needed at all
+    if selected_state == "All States" and selected_district == "All Districts":
+        filtered_gdf = gdf
+    else:
+        mask = np.ones(len(gdf), dtype=bool)
+        if selected_state != "All States":
+            mask &= (gdf["NAME_1"].values == selected_state)
+        if selected_district != "All Districts":
+            mask &= (gdf["NAME_2"].values == selected_district)
+        filtered_gdf = gdf[mask]
     
     # Check if showing district-level detail
     show_district_dashboard = (selected_state != "All States" and selected_district != "All Districts")
@@ -803,6 +1034,6 @@ if gdf is not None:
             st.error("District data not found")
     else:
         # Show original national/state level dashboard
-        render_national_state_dashboard(filtered_gdf, selected_category, selected_state)
+        render_national_state_dashboard(filtered_gdf, selected_category, selected_state, selected_district)
 else:
     st.error("Could not load shapefile. Please check file availability.")
\ No newline at end of file
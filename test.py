@@ -1,5 +1,14 @@
 import geopandas as gpd
-gdf = gpd.read_file("true_solar_suitability.shp")
+
+# pyogrio batch-reads through GDAL in C when installed - the script only
+# prints the schema, so attribute decoding speed is all that matters
+try:
+    import pyogrio  # noqa: F401
+    gpd.options.io_engine = "pyogrio"
+except ImportError:
+    pass
+
+gdf = gpd.read_file("true_solar_suitability.shp", rows=1)
 print("Available columns in shapefile:")
 for i, col in enumerate(gdf.columns):
-    print(f"{i+1}. {col}")
\ No newline at end of file
+    print(f"{i+1}. {col}")